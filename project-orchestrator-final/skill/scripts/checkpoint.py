@@ -10,36 +10,88 @@ Usage:
 """
 
 import argparse
+import atexit
 import hashlib
 import json
+import os
 import shutil
 import sys
-from datetime import datetime
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from pathlib import Path
 
 try:
     import yaml
+    # Prefer the libyaml C bindings - orders of magnitude faster on
+    # large state snapshots than the pure-Python loader/emitter.
+    try:
+        from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
 
 
+def resolve_data_file(directory: Path, stem: str) -> Path:
+    """Locate a state/manifest file, preferring the JSON flavor.
+
+    Projects initialized before the JSON default keep their .yaml
+    files; brand-new files are created as .json.
+    """
+    json_path = directory / f"{stem}.json"
+    if json_path.exists():
+        return json_path
+    yaml_path = directory / f"{stem}.yaml"
+    if yaml_path.exists():
+        return yaml_path
+    return json_path
+
+
 def load_yaml_file(path: Path) -> dict:
-    """Load YAML or JSON file"""
-    with open(path) as f:
-        if HAS_YAML:
-            return yaml.safe_load(f)
-        else:
+    """Load a state/checkpoint file, dispatching on extension"""
+    with open(path, encoding="utf-8") as f:
+        if path.suffix == ".json" or not HAS_YAML:
             return json.load(f)
+        return yaml.load(f, Loader=_YamlLoader)
 
 
 def save_yaml_file(path: Path, data: dict):
-    """Save YAML or JSON file"""
-    with open(path, 'w') as f:
-        if HAS_YAML:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+    """Save a state/checkpoint file, dispatching on extension"""
+    with open(path, 'w', encoding="utf-8") as f:
+        if path.suffix == ".json" or not HAS_YAML:
+            json.dump(data, f, ensure_ascii=False)
         else:
-            json.dump(data, f, indent=2)
+            yaml.dump(data, f, Dumper=_YamlDumper,
+                      default_flow_style=False, sort_keys=False)
+
+
+# Disk persistence runs on a single background worker so the checkpoint
+# hot path returns without waiting on serialization and fsync; one
+# worker keeps the writes ordered. Readers call flush_writes() first so
+# they always see their own writes.
+_io_executor = ThreadPoolExecutor(max_workers=1)
+_pending_writes = []
+
+
+def _submit_write(fn, *args):
+    _pending_writes.append(_io_executor.submit(fn, *args))
+
+
+def flush_writes():
+    """Block until every queued checkpoint write has hit disk"""
+    while _pending_writes:
+        _pending_writes.pop().result()
+
+
+atexit.register(flush_writes)
+
+
+# Every Nth checkpoint stores a full snapshot; the ones in between store
+# only a delta against their parent, which keeps checkpoint files at
+# O(|changes|) instead of O(|state|)
+ANCHOR_INTERVAL = 5
 
 
 def generate_checkpoint_id() -> str:
@@ -54,32 +106,182 @@ def compute_state_hash(state: dict) -> str:
     return hashlib.sha256(state_str.encode()).hexdigest()[:16]
 
 
+class HashingWriter:
+    """File-like wrapper that hashes everything written through it.
+
+    Lets json.dump serialize once while the digest is computed on the
+    fly, instead of serializing a second time just to hash.
+    """
+
+    def __init__(self, f, h):
+        self.f = f
+        self.h = h
+
+    def write(self, s: str):
+        self.h.update(s.encode())
+        self.f.write(s)
+
+    def hexdigest(self) -> str:
+        return self.h.hexdigest()[:16]
+
+
+def _escape_pointer(key) -> str:
+    """Escape a key for use in a JSON-Pointer path segment"""
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _diff_value(old, new, path: str, ops: list):
+    """Recursive worker for compute_delta"""
+    if type(old) is not type(new):
+        ops.append({"op": "replace", "path": path, "value": new})
+    elif isinstance(old, dict):
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove",
+                            "path": f"{path}/{_escape_pointer(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape_pointer(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                _diff_value(old[key], value, child, ops)
+    elif isinstance(old, list):
+        common = min(len(old), len(new))
+        for i in range(common):
+            _diff_value(old[i], new[i], f"{path}/{i}", ops)
+        for i in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+    elif old != new:
+        ops.append({"op": "replace", "path": path, "value": new})
+
+
+def compute_delta(parent_state: dict, new_state: dict) -> list:
+    """Diff two states into a list of JSON-Patch-style ops"""
+    ops = []
+    _diff_value(parent_state, new_state, "", ops)
+    return ops
+
+
+def apply_delta(state, ops: list):
+    """Apply ops produced by compute_delta and return the new state"""
+    for op in ops:
+        path = op["path"]
+        if path == "":
+            state = op["value"]
+            continue
+        parts = [p.replace("~1", "/").replace("~0", "~")
+                 for p in path.split("/")[1:]]
+        target = state
+        for part in parts[:-1]:
+            target = target[int(part)] if isinstance(target, list) else target[part]
+        last = parts[-1]
+        kind = op["op"]
+        if isinstance(target, list):
+            index = int(last)
+            if kind == "remove":
+                del target[index]
+            elif kind == "add":
+                target.insert(index, op["value"])
+            else:
+                target[index] = op["value"]
+        else:
+            if kind == "remove":
+                del target[last]
+            else:
+                target[last] = op["value"]
+    return state
+
+
+def load_checkpoint_state(checkpoints_path: Path, manifest: dict,
+                          checkpoint_id: str) -> dict:
+    """Reconstruct the full state recorded by a checkpoint.
+
+    Anchor checkpoints embed the snapshot directly; delta checkpoints
+    are replayed forward from the nearest anchor in their parent chain.
+    """
+    entries = {cp["id"]: cp for cp in manifest.get("checkpoints", [])}
+    deltas = []
+    current_id = checkpoint_id
+    seen = set()
+
+    while True:
+        if current_id in seen:
+            raise ValueError(f"Checkpoint parent chain has a cycle: {current_id}")
+        seen.add(current_id)
+
+        entry = entries.get(current_id)
+        if not entry:
+            raise ValueError(f"Checkpoint not found in manifest: {current_id}")
+
+        checkpoint_path = checkpoints_path / entry["file"]
+        if not checkpoint_path.exists():
+            raise FileNotFoundError(f"Checkpoint file missing: {checkpoint_path}")
+
+        checkpoint = load_yaml_file(checkpoint_path)
+        if "state_snapshot" in checkpoint:
+            state = checkpoint["state_snapshot"]
+            break
+
+        deltas.append(checkpoint["ops"])
+        current_id = checkpoint.get("parent")
+        if not current_id:
+            raise ValueError(
+                f"Delta checkpoint {checkpoint['id']} has no parent anchor"
+            )
+
+    for ops in reversed(deltas):
+        state = apply_delta(state, ops)
+
+    return state
+
+
 def create_checkpoint(base_path: Path, trigger: str, description: str = None,
                       task_id: str = None) -> dict:
     """Create a new checkpoint"""
-    
-    state_path = base_path / "state.yaml"
+
+    # The parent chain is read from disk, so earlier queued writes must
+    # land first
+    flush_writes()
+
+    state_path = resolve_data_file(base_path, "state")
     checkpoints_path = base_path / "checkpoints"
-    manifest_path = checkpoints_path / "manifest.yaml"
+    manifest_path = resolve_data_file(checkpoints_path, "manifest")
     
     # Load current state
     if not state_path.exists():
         raise FileNotFoundError("State file not found")
     
     state = load_yaml_file(state_path)
-    
+
     # Generate checkpoint
     checkpoint_id = generate_checkpoint_id()
     now = datetime.now().isoformat()
-    
+
+    # Load manifest first - delta checkpoints need to know their parent
+    if manifest_path.exists():
+        manifest = load_yaml_file(manifest_path)
+    else:
+        manifest = {
+            "checkpoints": [],
+            "latest": None,
+            "retention": {
+                "keep_last": 10,
+                "keep_milestones": True,
+                "max_age_days": 30
+            }
+        }
+
+    parent_id = manifest.get("latest")
+    since_anchor = manifest.get("since_anchor", 0)
+
     checkpoint = {
         "id": checkpoint_id,
         "created": now,
         "trigger": trigger,
         "description": description or f"Checkpoint triggered by {trigger}",
         "task_id": task_id,
-        "state_hash": compute_state_hash(state),
-        "state_snapshot": state,
         "context": {
             "phase": state.get("phase"),
             "phase_progress": state.get("phase_progress", 0),
@@ -89,88 +291,173 @@ def create_checkpoint(base_path: Path, trigger: str, description: str = None,
             ]
         }
     }
-    
-    # Save checkpoint file
-    checkpoint_file = f"{checkpoint_id}.yaml"
-    checkpoint_path = checkpoints_path / checkpoint_file
-    save_yaml_file(checkpoint_path, checkpoint)
-    
-    # Update manifest
-    if manifest_path.exists():
-        manifest = load_yaml_file(manifest_path)
+
+    if parent_id:
+        checkpoint["parent"] = parent_id
+
+    # Store a delta against the parent when possible, falling back to a
+    # full snapshot every ANCHOR_INTERVAL checkpoints (or whenever the
+    # parent chain cannot be reconstructed)
+    parent_state = None
+    if parent_id and since_anchor < ANCHOR_INTERVAL:
+        try:
+            parent_state = load_checkpoint_state(
+                checkpoints_path, manifest, parent_id
+            )
+        except (FileNotFoundError, ValueError, KeyError):
+            parent_state = None
+
+    if parent_state is not None:
+        checkpoint["ops"] = compute_delta(parent_state, state)
+        manifest["since_anchor"] = since_anchor + 1
+        is_full = False
     else:
-        manifest = {
-            "checkpoints": [],
-            "latest": None,
-            "retention": {
-                "keep_last": 10,
-                "keep_milestones": True,
-                "max_age_days": 30
-            }
-        }
-    
-    # Add to manifest
-    manifest["checkpoints"].append({
+        checkpoint["state_snapshot"] = state
+        manifest["since_anchor"] = 0
+        is_full = True
+
+    # Add to manifest; the worker fills in "hash" once the checkpoint
+    # bytes have streamed out, just before it writes the manifest
+    checkpoint_file = f"{checkpoint_id}.json"
+    checkpoint_path = checkpoints_path / checkpoint_file
+    entry = {
         "id": checkpoint_id,
         "created": now,
         "trigger": trigger,
         "task": task_id,
-        "file": checkpoint_file
-    })
-    
-    # Find parent (previous latest)
-    if manifest["latest"]:
-        checkpoint["parent"] = manifest["latest"]
-    
+        "file": checkpoint_file,
+        "parent": parent_id,
+        "full": is_full
+    }
+    manifest["checkpoints"].append(entry)
     manifest["latest"] = checkpoint_id
-    
+
     # Enforce retention policy
-    manifest = enforce_retention(manifest, checkpoints_path)
-    
-    save_yaml_file(manifest_path, manifest)
-    
+    manifest, stale_files = enforce_retention(manifest, checkpoints_path)
+
+    # Persist off the hot path: checkpoint file, manifest, and retention
+    # deletes all happen on the worker, in order
+    _submit_write(_persist_checkpoint, checkpoint_path, checkpoint, entry,
+                  manifest_path, manifest, stale_files)
+
     return checkpoint
 
 
-def enforce_retention(manifest: dict, checkpoints_path: Path) -> dict:
-    """Enforce checkpoint retention policy"""
+def _persist_checkpoint(checkpoint_path: Path, checkpoint: dict, entry: dict,
+                        manifest_path: Path, manifest: dict, stale_files: list):
+    """Worker-side persistence for create_checkpoint.
+
+    The checkpoint is written as JSON by default - YAML emission of
+    large nested snapshots is orders of magnitude slower for no benefit
+    on files only this tool reads back. The integrity hash is computed
+    over the bytes as they stream out and lives in the manifest, so the
+    file contents match the digest exactly.
+    """
+    # utf-8 explicitly: HashingWriter hashes the utf-8 encoding of each
+    # chunk, so the file must be written with the same codec for the
+    # stored digest to match the bytes on disk
+    with open(checkpoint_path, 'w', encoding="utf-8") as f:
+        writer = HashingWriter(f, hashlib.sha256())
+        json.dump(checkpoint, writer, ensure_ascii=False)
+    entry["hash"] = writer.hexdigest()
+
+    save_yaml_file(manifest_path, manifest)
+
+    # Delete evicted checkpoint files - unlink directly and tolerate
+    # ENOENT rather than paying a stat probe per file
+    for stale in stale_files:
+        try:
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def enforce_retention(manifest: dict, checkpoints_path: Path) -> tuple[dict, list]:
+    """Enforce checkpoint retention policy.
+
+    A checkpoint survives if it is one of the keep_last most recent,
+    younger than max_age_days, or a milestone while keep_milestones is
+    set - all decided in a single pass. Returns the updated manifest and
+    the evicted checkpoint files; the caller decides when the deletions
+    actually happen.
+    """
     retention = manifest.get("retention", {})
     keep_last = retention.get("keep_last", 10)
-    
+    keep_milestones = retention.get("keep_milestones", True)
+    max_age_days = retention.get("max_age_days", 30)
+
     checkpoints = manifest.get("checkpoints", [])
-    
+    stale_files = []
+
     if len(checkpoints) > keep_last:
-        # Keep most recent
-        to_remove = checkpoints[:-keep_last]
-        manifest["checkpoints"] = checkpoints[-keep_last:]
-        
-        # Delete old checkpoint files
-        for cp in to_remove:
-            cp_path = checkpoints_path / cp["file"]
-            if cp_path.exists():
-                cp_path.unlink()
-    
-    return manifest
+        cutoff = datetime.now() - timedelta(days=max_age_days)
+        recent = {cp["id"] for cp in checkpoints[-keep_last:]}
+        needed = set()
 
+        for cp in checkpoints:
+            if cp["id"] in recent:
+                needed.add(cp["id"])
+            elif keep_milestones and cp.get("trigger") == "milestone":
+                needed.add(cp["id"])
+            else:
+                try:
+                    if datetime.fromisoformat(cp["created"]) >= cutoff:
+                        needed.add(cp["id"])
+                except (KeyError, TypeError, ValueError):
+                    # Unparseable timestamp - keep rather than destroy
+                    needed.add(cp["id"])
+
+        # Also keep any ancestors a surviving delta still needs to reach
+        # its anchor snapshot (legacy entries without a "full" flag are
+        # standalone snapshots and need no ancestors)
+        by_id = {cp["id"]: cp for cp in checkpoints}
+        for cp_id in list(needed):
+            current = by_id[cp_id]
+            while not current.get("full", True) and current.get("parent"):
+                parent = by_id.get(current["parent"])
+                if parent is None or parent["id"] in needed:
+                    break
+                needed.add(parent["id"])
+                current = parent
+
+        manifest["checkpoints"] = [
+            cp for cp in checkpoints if cp["id"] in needed
+        ]
+        stale_files = [
+            checkpoints_path / cp["file"]
+            for cp in checkpoints if cp["id"] not in needed
+        ]
+
+    return manifest, stale_files
+
+
+def iter_checkpoints(base_path: Path):
+    """Yield manifest entries one at a time"""
+    flush_writes()
+
+    manifest_path = resolve_data_file(base_path / "checkpoints", "manifest")
 
-def list_checkpoints(base_path: Path) -> list:
-    """List all checkpoints"""
-    manifest_path = base_path / "checkpoints" / "manifest.yaml"
-    
     if not manifest_path.exists():
-        return []
-    
+        return
+
     manifest = load_yaml_file(manifest_path)
-    return manifest.get("checkpoints", [])
+    yield from manifest.get("checkpoints", [])
+
+
+def list_checkpoints(base_path: Path) -> list:
+    """List all checkpoints"""
+    return list(iter_checkpoints(base_path))
 
 
 def restore_checkpoint(base_path: Path, checkpoint_id: str = None,
                        latest: bool = False) -> dict:
     """Restore state from a checkpoint"""
-    
+
+    flush_writes()
+
     checkpoints_path = base_path / "checkpoints"
-    manifest_path = checkpoints_path / "manifest.yaml"
-    state_path = base_path / "state.yaml"
+    manifest_path = resolve_data_file(checkpoints_path, "manifest")
+    state_path = resolve_data_file(base_path, "state")
     
     if not manifest_path.exists():
         raise FileNotFoundError("No checkpoints found")
@@ -186,13 +473,11 @@ def restore_checkpoint(base_path: Path, checkpoint_id: str = None,
     if not checkpoint_id:
         raise ValueError("Must specify checkpoint ID or --latest")
     
-    # Find checkpoint in manifest
-    checkpoint_entry = None
-    for cp in manifest.get("checkpoints", []):
-        if cp["id"] == checkpoint_id:
-            checkpoint_entry = cp
-            break
-    
+    # Find checkpoint in manifest - index by id, retention is
+    # configurable so the list is not necessarily small
+    by_id = {cp["id"]: cp for cp in manifest.get("checkpoints", [])}
+    checkpoint_entry = by_id.get(checkpoint_id)
+
     if not checkpoint_entry:
         raise ValueError(f"Checkpoint not found: {checkpoint_id}")
     
@@ -200,30 +485,55 @@ def restore_checkpoint(base_path: Path, checkpoint_id: str = None,
     checkpoint_path = checkpoints_path / checkpoint_entry["file"]
     if not checkpoint_path.exists():
         raise FileNotFoundError(f"Checkpoint file missing: {checkpoint_path}")
-    
-    checkpoint = load_yaml_file(checkpoint_path)
-    
-    # Verify hash
-    state_snapshot = checkpoint.get("state_snapshot")
-    expected_hash = checkpoint.get("state_hash")
-    actual_hash = compute_state_hash(state_snapshot)
-    
-    if expected_hash and actual_hash != expected_hash:
-        print(f"Warning: Checkpoint hash mismatch. Data may be corrupted.")
+
+    expected_hash = checkpoint_entry.get("hash")
+    if expected_hash:
+        # Verify against the exact bytes on disk - one read, hashed
+        # directly, no re-serialization of the state dict
+        raw = checkpoint_path.read_bytes()
+        if hashlib.sha256(raw).hexdigest()[:16] != expected_hash:
+            print("Warning: Checkpoint hash mismatch. Data may be corrupted.")
+        checkpoint = json.loads(raw)
+    else:
+        checkpoint = load_yaml_file(checkpoint_path)
+
+    # Reconstruct state (delta checkpoints replay from their anchor)
+    if "state_snapshot" in checkpoint:
+        state_snapshot = checkpoint["state_snapshot"]
+    else:
+        state_snapshot = load_checkpoint_state(
+            checkpoints_path, manifest, checkpoint_id
+        )
+
+    # Legacy checkpoints embed a hash of the state dict itself
+    legacy_hash = checkpoint.get("state_hash")
+    if legacy_hash and compute_state_hash(state_snapshot) != legacy_hash:
+        print("Warning: Checkpoint hash mismatch. Data may be corrupted.")
     
     # Backup current state before restore
     if state_path.exists():
-        backup_path = base_path / "backups" / f"state_before_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.yaml"
+        backup_path = base_path / "backups" / (
+            f"state_before_restore_"
+            f"{datetime.now().strftime('%Y%m%d_%H%M%S')}{state_path.suffix}"
+        )
         backup_path.parent.mkdir(exist_ok=True)
         shutil.copy(state_path, backup_path)
     
-    # Restore state
-    save_yaml_file(state_path, state_snapshot)
-    
-    # Update session info
+    # Update session info, then restore with a single write. Going via a
+    # sibling tempfile + rename keeps the write atomic, so a crash
+    # mid-restore cannot leave a truncated state file behind.
     state_snapshot["session"]["last_updated"] = datetime.now().isoformat()
     state_snapshot["session"]["notes"] = f"Restored from checkpoint {checkpoint_id}"
-    save_yaml_file(state_path, state_snapshot)
+
+    tmp = tempfile.NamedTemporaryFile(
+        dir=base_path, suffix=state_path.suffix, delete=False)
+    tmp.close()
+    try:
+        save_yaml_file(Path(tmp.name), state_snapshot)
+        os.replace(tmp.name, state_path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
     
     return {
         "restored_from": checkpoint_id,
@@ -298,16 +608,26 @@ def main():
                 description=args.description,
                 task_id=args.task
             )
+            # Drain the background write here so persistence failures
+            # surface through the normal Error:/exit-1 path instead of
+            # only tripping the atexit safety net after success printed
+            flush_writes()
             print(f"✓ Created checkpoint: {checkpoint['id']}")
             print(f"  Trigger: {checkpoint['trigger']}")
             print(f"  Phase: {checkpoint['context']['phase']}")
         
         elif args.command == "list":
-            checkpoints = list_checkpoints(base_path)
-            
             if args.json:
-                print(json.dumps(checkpoints, indent=2))
+                # Stream entries straight to stdout instead of holding
+                # the list plus a second fully-serialized copy
+                out = sys.stdout
+                out.write("[")
+                for i, cp in enumerate(iter_checkpoints(base_path)):
+                    out.write(",\n" if i else "\n")
+                    out.write(json.dumps(cp, indent=2))
+                out.write("\n]\n")
             else:
+                checkpoints = list_checkpoints(base_path)
                 if not checkpoints:
                     print("No checkpoints found")
                 else:
@@ -9,30 +9,55 @@ Usage:
 """
 
 import argparse
-import hashlib
 import json
 import sys
+import zlib
+from array import array
 from pathlib import Path
-from collections import deque
+from collections import Counter, deque
 
 
-def jaccard_similarity(text1: str, text2: str) -> float:
-    """Calculate Jaccard similarity between two texts"""
-    words1 = set(text1.lower().split())
-    words2 = set(text2.lower().split())
-    
+def jaccard_sets(words1: frozenset, words2: frozenset) -> float:
+    """Calculate Jaccard similarity between two token sets"""
     if not words1 or not words2:
         return 0.0
-    
+
     intersection = len(words1 & words2)
-    union = len(words1 | words2)
-    
-    return intersection / union
+    # |A u B| = |A| + |B| - |A n B|, no need to build the union set
+    return intersection / (len(words1) + len(words2) - intersection)
+
+
+def tokenize(text: str) -> frozenset:
+    """Tokenize text into the set of its lowercased words"""
+    return frozenset(text.lower().split())
 
 
-def hash_text(text: str) -> str:
-    """Generate hash of text for exact match detection"""
-    return hashlib.sha256(text.encode()).hexdigest()[:16]
+def jaccard_similarity(text1: str, text2: str) -> float:
+    """Calculate Jaccard similarity between two texts"""
+    return jaccard_sets(tokenize(text1), tokenize(text2))
+
+
+# orjson parses multi-MB session logs several times faster than stdlib
+# json; both accept bytes, so the log is read in binary either way
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Exact-repeat detection needs throughput, not cryptographic strength:
+# prefer xxhash when installed, fall back to stdlib crc32
+try:
+    import xxhash
+
+    def hash_text(text: str) -> int:
+        """Generate hash of text for exact match detection"""
+        return xxhash.xxh3_64_intdigest(text.encode())
+except ImportError:
+    def hash_text(text: str) -> int:
+        """Generate hash of text for exact match detection"""
+        return zlib.crc32(text.encode())
 
 
 def detect_exact_match(text: str, history: list) -> bool:
@@ -65,64 +90,121 @@ def analyze_session_log(log_path: Path, window_size: int = 5,
         raise FileNotFoundError(f"Log file not found: {log_path}")
     
     outputs = []
-    loop_events = []
+
+    # Accumulate events as flat scalar arrays (9 bytes per event)
+    # instead of a ~200-byte dict per event; the dicts are only
+    # materialized for the final report
+    event_indices = array('q')
+    event_kinds = array('b')    # 0 = exact_match, 1 = high_similarity
+    event_sims = array('d')
     
-    with open(log_path) as f:
+    # Binary read with a large buffer; the parsers accept raw lines
+    # (trailing newline included) so no per-line strip/decode is needed
+    with open(log_path, 'rb', buffering=1 << 20) as f:
         for line in f:
             try:
-                event = json.loads(line.strip())
+                event = _json_loads(line)
                 if "output" in event:
                     outputs.append(event["output"])
-            except json.JSONDecodeError:
+            except ValueError:
                 continue
     
-    # Sliding window analysis
+    # Sliding window analysis. Hash and tokenize each output once up
+    # front and keep a rolling multiset of the window hashes, instead of
+    # re-hashing/re-splitting the whole window at every position
+    # (O(N) hashes and tokenizations rather than O(N*W)).
+    hashes = [hash_text(o) for o in outputs]
+    window = Counter(hashes[:window_size])
+
+    # Represent each output as a bitmask over the session vocabulary.
+    # Jaccard then reduces to big-int AND plus popcount, both C-level
+    # bulk operations, instead of hashed set intersections per pair.
+    vocab = {}
+    bitmasks = []
+    popcounts = []
+    for output in outputs:
+        mask = 0
+        for word in tokenize(output):
+            index = vocab.setdefault(word, len(vocab))
+            mask |= 1 << index
+        bitmasks.append(mask)
+        popcounts.append(mask.bit_count())
+
     for i in range(window_size, len(outputs)):
-        current = outputs[i]
-        history = outputs[i-window_size:i]
-        
+        # Advance the window to cover hashes[i-window_size:i]
+        if i > window_size:
+            evicted = hashes[i - window_size - 1]
+            window[evicted] -= 1
+            if not window[evicted]:
+                del window[evicted]
+            window[hashes[i - 1]] += 1
+
         # Check for exact match
-        if detect_exact_match(current, history):
+        if window.get(hashes[i]):
+            event_indices.append(i)
+            event_kinds.append(0)
+            event_sims.append(1.0)
+            continue
+
+        # Check for similarity against the cached window bitmasks
+        is_similar = False
+        similarity = 0.0
+        current_mask = bitmasks[i]
+        current_count = popcounts[i]
+        for j in range(i - window_size, i):
+            intersection = (current_mask & bitmasks[j]).bit_count()
+            union = current_count + popcounts[j] - intersection
+            similarity = max(similarity, intersection / union if union else 0.0)
+            if similarity >= threshold:
+                is_similar = True
+                break
+        if is_similar:
+            event_indices.append(i)
+            event_kinds.append(1)
+            event_sims.append(similarity)
+
+    # Materialize the report dicts only now, once per event
+    loop_events = []
+    for index, kind, sim in zip(event_indices, event_kinds, event_sims):
+        if kind == 0:
             loop_events.append({
-                "index": i,
+                "index": index,
                 "type": "exact_match",
                 "severity": "high"
             })
-            continue
-        
-        # Check for similarity
-        is_similar, similarity = detect_similarity_loop(current, history, threshold)
-        if is_similar:
+        else:
             loop_events.append({
-                "index": i,
+                "index": index,
                 "type": "high_similarity",
-                "similarity": similarity,
-                "severity": "medium" if similarity < 0.9 else "high"
+                "similarity": sim,
+                "severity": "medium" if sim < 0.9 else "high"
             })
-    
+
     return {
         "total_outputs": len(outputs),
         "loop_events": loop_events,
         "loop_detected": len(loop_events) > 0,
-        "consecutive_loops": count_consecutive(loop_events)
+        "consecutive_loops": count_consecutive(event_indices)
     }
 
 
-def count_consecutive(events: list) -> int:
-    """Count maximum consecutive loop events"""
-    if not events:
+def count_consecutive(indices) -> int:
+    """Count maximum run of consecutive loop-event indices"""
+    if not indices:
         return 0
-    
+
     max_consecutive = 1
     current_consecutive = 1
-    
-    for i in range(1, len(events)):
-        if events[i]["index"] == events[i-1]["index"] + 1:
+    previous = indices[0]
+
+    for index in indices[1:]:
+        if index == previous + 1:
             current_consecutive += 1
             max_consecutive = max(max_consecutive, current_consecutive)
         else:
             current_consecutive = 1
-    
+        previous = index
+
     return max_consecutive
 
 
@@ -9,6 +9,7 @@ Usage:
 """
 
 import argparse
+import io
 import os
 import sys
 from datetime import datetime
@@ -18,20 +19,23 @@ import json
 # YAML handling - try to use PyYAML, fall back to simple format
 try:
     import yaml
+    # Prefer the libyaml C bindings when PyYAML was built with them
+    try:
+        from yaml import CSafeDumper as _YamlDumper
+    except ImportError:
+        from yaml import SafeDumper as _YamlDumper
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
 
 
-def generate_project_id():
+def generate_project_id(timestamp: str):
     """Generate unique project ID"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     return f"proj_{timestamp}"
 
 
-def generate_session_id():
+def generate_session_id(timestamp: str):
     """Generate unique session ID"""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     return f"sess_{timestamp}"
 
 
@@ -49,15 +53,53 @@ def create_directory_structure(base_path: Path):
         print(f"  Created: {directory}")
 
 
-def create_state_file(base_path: Path, project_name: str, goal: str, 
-                      constraints: list = None):
-    """Create the initial state.yaml file"""
-    
-    now = datetime.now().isoformat()
-    
+def stream_state_yaml(f, state: dict):
+    """Stream the initial state as YAML, line by line.
+
+    The schema is fixed, so there is no need to build an emitter node
+    tree for the whole document. String scalars are quoted with
+    json.dumps, which is valid YAML flow style and handles embedded
+    quotes/newlines, so this works with or without PyYAML installed.
+    """
+    q = json.dumps
+    project = state["project"]
+    session = state["session"]
+
+    f.write("project:\n")
+    f.write(f"  id: {q(project['id'])}\n")
+    f.write(f"  name: {q(project['name'])}\n")
+    f.write(f"  goal: {q(project['goal'])}\n")
+    f.write(f"  created: {q(project['created'])}\n")
+    if project["constraints"]:
+        f.write("  constraints:\n")
+        for constraint in project["constraints"]:
+            f.write(f"    - {q(constraint)}\n")
+    else:
+        f.write("  constraints: []\n")
+    f.write(f"phase: {q(state['phase'])}\n")
+    f.write(f"phase_started: {q(state['phase_started'])}\n")
+    f.write(f"phase_progress: {state['phase_progress']}\n")
+    f.write("tasks: []\n")
+    f.write("checkpoints: []\n")
+    f.write("session:\n")
+    f.write(f"  id: {q(session['id'])}\n")
+    f.write(f"  started: {q(session['started'])}\n")
+    f.write(f"  last_updated: {q(session['last_updated'])}\n")
+    f.write(f"  context_usage: {session['context_usage']}\n")
+    f.write(f"  compactions: {session['compactions']}\n")
+    f.write(f"  notes: {q(session['notes'])}\n")
+    f.write("blocked_tasks: []\n")
+    f.write("escalated_tasks: []\n")
+
+
+def create_state_file(base_path: Path, project_name: str, goal: str,
+                      constraints: list, now: str, stamp: str,
+                      fmt: str = "json"):
+    """Build the initial state file as (path, content)"""
+
     state = {
         "project": {
-            "id": generate_project_id(),
+            "id": generate_project_id(stamp),
             "name": project_name,
             "goal": goal,
             "created": now,
@@ -69,7 +111,7 @@ def create_state_file(base_path: Path, project_name: str, goal: str,
         "tasks": [],
         "checkpoints": [],
         "session": {
-            "id": generate_session_id(),
+            "id": generate_session_id(stamp),
             "started": now,
             "last_updated": now,
             "context_usage": 0.0,
@@ -80,45 +122,19 @@ def create_state_file(base_path: Path, project_name: str, goal: str,
         "escalated_tasks": []
     }
     
-    state_path = base_path / "state.yaml"
-    
-    if HAS_YAML:
-        with open(state_path, 'w') as f:
-            yaml.dump(state, f, default_flow_style=False, sort_keys=False)
-    else:
-        # Simple YAML-like format without library
-        with open(state_path, 'w') as f:
-            f.write(f"# Project Orchestrator State\n")
-            f.write(f"# Generated: {now}\n\n")
-            f.write(f"project:\n")
-            f.write(f"  id: \"{state['project']['id']}\"\n")
-            f.write(f"  name: \"{project_name}\"\n")
-            f.write(f"  goal: |\n    {goal}\n")
-            f.write(f"  created: \"{now}\"\n")
-            f.write(f"  constraints:\n")
-            for c in (constraints or []):
-                f.write(f"    - \"{c}\"\n")
-            f.write(f"\nphase: \"planning\"\n")
-            f.write(f"phase_started: \"{now}\"\n")
-            f.write(f"phase_progress: 0.0\n")
-            f.write(f"\ntasks: []\n")
-            f.write(f"checkpoints: []\n")
-            f.write(f"\nsession:\n")
-            f.write(f"  id: \"{state['session']['id']}\"\n")
-            f.write(f"  started: \"{now}\"\n")
-            f.write(f"  last_updated: \"{now}\"\n")
-            f.write(f"  context_usage: 0.0\n")
-            f.write(f"  notes: \"Project initialized\"\n")
-    
-    print(f"  Created: {state_path}")
-    return state
+    if fmt == "json":
+        return base_path / "state.json", json.dumps(state, indent=2) + "\n"
 
+    buffer = io.StringIO()
+    stream_state_yaml(buffer, state)
+
+    return base_path / "state.yaml", buffer.getvalue()
+
+
+def create_context_file(base_path: Path, project_name: str, goal: str,
+                        now: str, state_name: str = "state.json"):
+    """Build the CONTEXT.md file for cold-start resume as (path, content)"""
 
-def create_context_file(base_path: Path, project_name: str, goal: str):
-    """Create the CONTEXT.md file for cold-start resume"""
-    
-    now = datetime.now().strftime("%Y-%m-%d %H:%M")
-    
     context = f"""# Project: {project_name}
 
 > {goal}
@@ -138,7 +154,7 @@ def create_context_file(base_path: Path, project_name: str, goal: str):
 ## Important Files
 | File | Purpose |
 |------|---------|
-| `.orchestrator/state.yaml` | Full project state |
+| `.orchestrator/{state_name}` | Full project state |
 
 ## Next Steps
 1. Decompose the project goal into MECE tasks
@@ -147,7 +163,7 @@ def create_context_file(base_path: Path, project_name: str, goal: str):
 
 ## How to Resume
 1. Read this file for context
-2. Check `.orchestrator/state.yaml` for detailed state
+2. Check `.orchestrator/{state_name}` for detailed state
 3. If no tasks exist, run decomposition first
 
 ---
@@ -155,18 +171,12 @@ def create_context_file(base_path: Path, project_name: str, goal: str):
 - {now}: Project initialized
 """
     
-    context_path = base_path / "CONTEXT.md"
-    with open(context_path, 'w') as f:
-        f.write(context)
-    
-    print(f"  Created: {context_path}")
+    return base_path / "CONTEXT.md", context
 
 
-def create_todo_file(base_path: Path, project_name: str):
-    """Create the todo.md attention anchor"""
-    
-    now = datetime.now().isoformat()
-    
+def create_todo_file(base_path: Path, project_name: str, now: str):
+    """Build the todo.md attention anchor as (path, content)"""
+
     todo = f"""# Active Todo
 
 ## RIGHT NOW
@@ -187,16 +197,12 @@ Updated: {now}
 Goal: Complete "{project_name}" project
 """
     
-    todo_path = base_path / "todo.md"
-    with open(todo_path, 'w') as f:
-        f.write(todo)
-    
-    print(f"  Created: {todo_path}")
+    return base_path / "todo.md", todo
 
 
-def create_checkpoint_manifest(base_path: Path):
-    """Create empty checkpoint manifest"""
-    
+def create_checkpoint_manifest(base_path: Path, fmt: str = "json"):
+    """Build the empty checkpoint manifest as (path, content)"""
+
     manifest = {
         "checkpoints": [],
         "latest": None,
@@ -206,40 +212,39 @@ def create_checkpoint_manifest(base_path: Path):
             "max_age_days": 30
         }
     }
-    
+
+    if fmt == "json":
+        return (base_path / "checkpoints" / "manifest.json",
+                json.dumps(manifest, indent=2) + "\n")
+
     manifest_path = base_path / "checkpoints" / "manifest.yaml"
-    
+
     if HAS_YAML:
-        with open(manifest_path, 'w') as f:
-            yaml.dump(manifest, f, default_flow_style=False)
+        content = yaml.dump(manifest, Dumper=_YamlDumper,
+                            default_flow_style=False)
     else:
-        with open(manifest_path, 'w') as f:
-            f.write("checkpoints: []\n")
-            f.write("latest: null\n")
-            f.write("retention:\n")
-            f.write("  keep_last: 10\n")
-            f.write("  keep_milestones: true\n")
-            f.write("  max_age_days: 30\n")
-    
-    print(f"  Created: {manifest_path}")
+        content = (
+            "checkpoints: []\n"
+            "latest: null\n"
+            "retention:\n"
+            "  keep_last: 10\n"
+            "  keep_milestones: true\n"
+            "  max_age_days: 30\n"
+        )
 
+    return manifest_path, content
+
+
+def create_session_log(base_path: Path, project_name: str, now: str):
+    """Build the session.jsonl log file as (path, content)"""
 
-def create_session_log(base_path: Path, project_name: str):
-    """Create session.jsonl log file"""
-    
-    now = datetime.now().isoformat()
-    
     initial_event = {
         "timestamp": now,
         "event": "project_initialized",
         "project": project_name
     }
-    
-    log_path = base_path / "session.jsonl"
-    with open(log_path, 'w') as f:
-        f.write(json.dumps(initial_event) + "\n")
-    
-    print(f"  Created: {log_path}")
+
+    return base_path / "session.jsonl", json.dumps(initial_event) + "\n"
 
 
 def main():
@@ -266,6 +271,13 @@ def main():
         default=".orchestrator",
         help="Path for orchestrator directory (default: .orchestrator)"
     )
+    parser.add_argument(
+        "--format", "-f",
+        choices=["json", "yaml"],
+        default="json",
+        help="State/manifest file format - JSON parses orders of "
+             "magnitude faster, YAML is easier to hand-edit (default: json)"
+    )
     
     args = parser.parse_args()
     
@@ -289,17 +301,46 @@ def main():
     print("Creating directory structure...")
     create_directory_structure(base_path)
     
-    # Create files
+    # One clock read for the whole init; every file shares the same
+    # timestamps
+    now_dt = datetime.now()
+    now_iso = now_dt.isoformat()
+    now_stamp = now_dt.strftime("%Y%m%d_%H%M%S")
+    now_human = now_dt.strftime("%Y-%m-%d %H:%M")
+
+    # Build all file contents first, then write them in one pass with a
+    # single metadata sync per directory instead of an implicit flush
+    # per file
     print("\nCreating files...")
-    create_state_file(base_path, args.name, args.goal, args.constraints)
-    create_context_file(base_path, args.name, args.goal)
-    create_todo_file(base_path, args.name)
-    create_checkpoint_manifest(base_path)
-    create_session_log(base_path, args.name)
+    state_path, state_content = create_state_file(
+        base_path, args.name, args.goal, args.constraints,
+        now_iso, now_stamp, args.format
+    )
+    files = [
+        (state_path, state_content),
+        create_context_file(base_path, args.name, args.goal, now_human,
+                            state_path.name),
+        create_todo_file(base_path, args.name, now_iso),
+        create_checkpoint_manifest(base_path, args.format),
+        create_session_log(base_path, args.name, now_iso),
+    ]
+
+    for path, content in files:
+        with open(path, 'w') as f:
+            f.write(content)
+        print(f"  Created: {path}")
+
+    if hasattr(os, "O_DIRECTORY"):
+        for directory in {path.parent for path, _ in files}:
+            dir_fd = os.open(directory, os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
     
     print(f"\n✓ Project '{args.name}' initialized successfully!")
     print(f"\nNext steps:")
-    print(f"  1. Review .orchestrator/state.yaml")
+    print(f"  1. Review {state_path}")
     print(f"  2. Decompose project goal into tasks")
     print(f"  3. Begin execution")
 
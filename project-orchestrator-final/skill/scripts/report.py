@@ -10,35 +10,126 @@ Usage:
 """
 
 import argparse
+import calendar
 import json
+import re
 import sys
+from heapq import nlargest
 from datetime import datetime
 from pathlib import Path
-from collections import Counter
+from collections import namedtuple
 
 try:
     import yaml
+    # Prefer the libyaml C bindings when PyYAML was built with them
+    try:
+        from yaml import CSafeLoader as _YamlLoader
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
 
+# orjson parses large JSON state files several times faster than stdlib
+# json; it takes the raw bytes directly
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Pick the .yaml reader once at import instead of testing HAS_YAML on
+# every call; without PyYAML, .yaml paths fall back to JSON
+if HAS_YAML:
+    def _load_fn(path: Path) -> dict:
+        with open(path) as f:
+            return yaml.load(f, Loader=_YamlLoader)
+else:
+    def _load_fn(path: Path) -> dict:
+        return _json_loads(path.read_bytes())
+
 
 def load_state(path: Path) -> dict:
     """Load state file"""
     if not path.exists():
-        raise FileNotFoundError(f"State file not found: {path}")
-    
-    with open(path) as f:
-        if HAS_YAML:
-            return yaml.safe_load(f)
+        # Projects initialized with the JSON default keep state.json
+        if path.suffix == ".yaml" and path.with_suffix(".json").exists():
+            path = path.with_suffix(".json")
         else:
-            return json.load(f)
+            raise FileNotFoundError(f"State file not found: {path}")
+
+    if path.suffix == ".json":
+        return _json_loads(path.read_bytes())
+    return _load_fn(path)
+
+
+# Status vocabulary, mirroring VALID_STATUSES in validate_state.py
+DONE_STATUSES = frozenset(("completed", "verified"))
+BLOCKED_STATUSES = frozenset(("blocked", "needs_human"))
+
+# Per-status buckets plus the derived lists the report sections need,
+# all filled in one pass over the task list
+TaskBuckets = namedtuple("TaskBuckets", [
+    "total", "pending", "in_progress", "completed", "verified",
+    "blocked", "needs_human", "done", "timed_completed", "counts"
+])
+
+
+def _completed_key(task: dict) -> str:
+    return task.get("completed_at", "")
+
+
+def partition_tasks(tasks: list) -> TaskBuckets:
+    """Bucket tasks by status in a single pass.
+
+    Every report section used to rescan the full task list; this fills
+    all the per-status lists at once so each task is visited exactly
+    once.
+    """
+    pending = []
+    in_progress = []
+    completed = []
+    verified = []
+    blocked = []
+    needs_human = []
+    done = []
+    timed_completed = []
+
+    by_status = {
+        "pending": pending,
+        "in_progress": in_progress,
+        "completed": completed,
+        "verified": verified,
+        "blocked": blocked,
+        "needs_human": needs_human,
+    }
+
+    # Seed the counts with every known status so the partition loop can
+    # increment unconditionally
+    counts = dict.fromkeys(by_status, 0)
+
+    for task in tasks:
+        get = task.get
+        status = get("status", "pending")
+        bucket = by_status.get(status)
+        if bucket is not None:
+            bucket.append(task)
+            counts[status] += 1
+        if status in DONE_STATUSES:
+            done.append(task)
+            if get("completed_at") and get("started_at"):
+                timed_completed.append(task)
+
+    return TaskBuckets(len(tasks), pending, in_progress, completed,
+                       verified, blocked, needs_human, done,
+                       timed_completed, counts)
 
 
-def calculate_progress(tasks: list) -> dict:
+def calculate_progress(buckets: TaskBuckets) -> dict:
     """Calculate detailed progress metrics"""
-    
-    if not tasks:
+
+    total = buckets.total
+    if not total:
         return {
             "total": 0,
             "completed": 0,
@@ -46,60 +137,81 @@ def calculate_progress(tasks: list) -> dict:
             "in_progress": 0,
             "pending": 0,
             "blocked": 0,
+            "needs_human": 0,
+            "done": 0,
             "percentage": 0.0
         }
-    
-    status_counts = Counter(t.get("status", "pending") for t in tasks)
-    total = len(tasks)
-    
+
+    counts = buckets.counts
+
     # Count completed as verified + completed
-    done = status_counts.get("verified", 0) + status_counts.get("completed", 0)
-    
+    done = counts["completed"] + counts["verified"]
+
     return {
         "total": total,
-        "completed": status_counts.get("completed", 0),
-        "verified": status_counts.get("verified", 0),
-        "in_progress": status_counts.get("in_progress", 0),
-        "pending": status_counts.get("pending", 0),
-        "blocked": status_counts.get("blocked", 0),
-        "needs_human": status_counts.get("needs_human", 0),
+        "completed": counts["completed"],
+        "verified": counts["verified"],
+        "in_progress": counts["in_progress"],
+        "pending": counts["pending"],
+        "blocked": counts["blocked"],
+        "needs_human": counts["needs_human"],
         "done": done,
-        "percentage": (done / total) * 100 if total > 0 else 0
+        "percentage": (done / total) * 100
     }
 
 
-def get_task_timeline(tasks: list) -> list:
-    """Get completed tasks in order"""
-    completed = [t for t in tasks if t.get("status") in ["completed", "verified"]]
-    return sorted(completed, key=lambda t: t.get("completed_at", ""))
+def get_recent_completed(buckets: TaskBuckets, n: int = 10) -> list:
+    """Get the n most recently completed tasks, oldest first.
 
+    nlargest selects the tail in one O(len * log n) pass; the report
+    never shows more than n completions, so the rest of the done bucket
+    is never sorted.
+    """
+    recent = nlargest(n, buckets.done, key=_completed_key)
+    recent.reverse()
+    return recent
 
-def get_blockers(tasks: list) -> list:
+
+def get_blockers(buckets: TaskBuckets) -> list:
     """Get blocked tasks with reasons"""
-    blocked = [t for t in tasks if t.get("status") in ["blocked", "needs_human"]]
-    return blocked
+    return buckets.blocked + buckets.needs_human
+
+
+# Task timestamps are ISO-8601 down to seconds; only the duration in
+# seconds matters here, so a compiled regex plus calendar.timegm is far
+# cheaper than building full datetime objects
+_TS_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})")
+
 
+def _parse_epoch(timestamp: str):
+    """Parse an ISO timestamp to epoch seconds, or None if malformed"""
+    match = _TS_RE.match(timestamp)
+    if not match:
+        return None
+    year, month, day, hour, minute, second = match.groups()
+    return calendar.timegm((int(year), int(month), int(day),
+                            int(hour), int(minute), int(second), 0, 0, 0))
 
-def estimate_remaining(tasks: list, progress: dict) -> dict:
+
+def estimate_remaining(buckets: TaskBuckets, progress: dict) -> dict:
     """Estimate remaining work"""
-    
+
     remaining_tasks = progress["pending"] + progress["in_progress"]
-    
+
     # Estimate based on average task time (if we have completed tasks)
-    completed_tasks = [t for t in tasks if t.get("completed_at") and t.get("started_at")]
-    
+    completed_tasks = buckets.timed_completed
+
     if completed_tasks:
         # Calculate average duration
         total_duration = 0
         for t in completed_tasks:
-            try:
-                start = datetime.fromisoformat(t["started_at"].replace("Z", "+00:00"))
-                end = datetime.fromisoformat(t["completed_at"].replace("Z", "+00:00"))
-                total_duration += (end - start).total_seconds()
-            except:
+            start = _parse_epoch(t["started_at"])
+            end = _parse_epoch(t["completed_at"])
+            if start is None or end is None:
                 continue
-        
-        avg_duration = total_duration / len(completed_tasks) if completed_tasks else 0
+            total_duration += end - start
+
+        avg_duration = total_duration / len(completed_tasks)
         estimated_remaining = avg_duration * remaining_tasks
         
         return {
@@ -124,14 +236,26 @@ def generate_markdown_report(state: dict) -> str:
     tasks = state.get("tasks", [])
     session = state.get("session", {})
     
-    progress = calculate_progress(tasks)
-    timeline = get_task_timeline(tasks)
-    blockers = get_blockers(tasks)
-    remaining = estimate_remaining(tasks, progress)
+    buckets = partition_tasks(tasks)
+    progress = calculate_progress(buckets)
+    recent = get_recent_completed(buckets)
+    blockers = get_blockers(buckets)
+    remaining = estimate_remaining(buckets, progress)
     
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
-    
-    report = f"""# Progress Report: {project.get('name', 'Unknown Project')}
+
+    # Build the background run once and slice it per row, rather than
+    # repeating '░' from scratch for every bar
+    n_verified = progress['verified']
+    n_completed = progress['completed']
+    n_in_progress = progress['in_progress']
+    n_pending = progress['pending']
+    n_blocked = progress['blocked']
+    bg = '░' * progress['total']
+
+    # Accumulate fragments and join once at the end; repeated "report +="
+    # recopies the whole string on every append
+    parts = [f"""# Progress Report: {project.get('name', 'Unknown Project')}
 
 Generated: {now}
 
@@ -148,85 +272,89 @@ Generated: {now}
 ## Task Status Breakdown
 
 ```
-Verified:    {'█' * progress['verified']}{'░' * (progress['total'] - progress['verified'])} {progress['verified']}
-Completed:   {'█' * progress['completed']}{'░' * (progress['total'] - progress['completed'])} {progress['completed']}
-In Progress: {'▓' * progress['in_progress']}{'░' * (progress['total'] - progress['in_progress'])} {progress['in_progress']}
-Pending:     {'░' * progress['pending']} {progress['pending']}
-Blocked:     {'▒' * progress['blocked']} {progress['blocked']}
+Verified:    {'█' * n_verified}{bg[n_verified:]} {n_verified}
+Completed:   {'█' * n_completed}{bg[n_completed:]} {n_completed}
+In Progress: {'▓' * n_in_progress}{bg[n_in_progress:]} {n_in_progress}
+Pending:     {bg[:n_pending]} {n_pending}
+Blocked:     {'▒' * n_blocked} {n_blocked}
 ```
 
 ## Project Goal
 
 {project.get('goal', 'No goal specified')}
 
-"""
-    
-    # Completed tasks
-    if timeline:
-        report += "## Completed Tasks\n\n"
-        for t in timeline[-10:]:  # Last 10
-            report += f"- ✓ **{t.get('id')}**: {t.get('name')}\n"
-            if t.get('completed_at'):
-                report += f"  - Completed: {t['completed_at'][:16]}\n"
-        report += "\n"
-    
+"""]
+    append = parts.append
+
+    # Completed tasks (last 10)
+    if recent:
+        append("## Completed Tasks\n\n")
+        for t in recent:
+            get = t.get
+            append(f"- ✓ **{get('id')}**: {get('name')}\n")
+            if get('completed_at'):
+                append(f"  - Completed: {t['completed_at'][:16]}\n")
+        append("\n")
+
     # Current work
-    in_progress = [t for t in tasks if t.get("status") == "in_progress"]
+    in_progress = buckets.in_progress
     if in_progress:
-        report += "## Currently In Progress\n\n"
+        append("## Currently In Progress\n\n")
         for t in in_progress:
-            report += f"- 🔄 **{t.get('id')}**: {t.get('name')}\n"
-            if t.get('started_at'):
-                report += f"  - Started: {t['started_at'][:16]}\n"
-        report += "\n"
-    
+            get = t.get
+            append(f"- 🔄 **{get('id')}**: {get('name')}\n")
+            if get('started_at'):
+                append(f"  - Started: {t['started_at'][:16]}\n")
+        append("\n")
+
     # Blockers
     if blockers:
-        report += "## ⚠️ Blockers\n\n"
+        append("## ⚠️ Blockers\n\n")
         for t in blockers:
-            report += f"- **{t.get('id')}**: {t.get('name')}\n"
-            report += f"  - Status: {t.get('status')}\n"
-            if t.get('notes'):
-                report += f"  - Notes: {t.get('notes')}\n"
-        report += "\n"
-    
+            get = t.get
+            append(f"- **{get('id')}**: {get('name')}\n")
+            append(f"  - Status: {get('status')}\n")
+            if get('notes'):
+                append(f"  - Notes: {get('notes')}\n")
+        append("\n")
+
     # Up next
-    pending = [t for t in tasks if t.get("status") == "pending"]
+    pending = buckets.pending
     if pending:
-        report += "## Up Next\n\n"
+        append("## Up Next\n\n")
         for t in pending[:5]:  # Next 5
-            report += f"- ⏳ **{t.get('id')}**: {t.get('name')}\n"
+            append(f"- ⏳ **{t.get('id')}**: {t.get('name')}\n")
         if len(pending) > 5:
-            report += f"- ... and {len(pending) - 5} more\n"
-        report += "\n"
-    
+            append(f"- ... and {len(pending) - 5} more\n")
+        append("\n")
+
     # Estimates
     if remaining["estimated_remaining_hours"] is not None:
-        report += "## Time Estimates\n\n"
-        report += f"- Average task duration: {remaining['avg_task_duration_minutes']:.0f} minutes\n"
-        report += f"- Remaining tasks: {remaining['remaining_tasks']}\n"
-        report += f"- Estimated time remaining: {remaining['estimated_remaining_hours']:.1f} hours\n"
-        report += "\n"
-    
+        append("## Time Estimates\n\n")
+        append(f"- Average task duration: {remaining['avg_task_duration_minutes']:.0f} minutes\n")
+        append(f"- Remaining tasks: {remaining['remaining_tasks']}\n")
+        append(f"- Estimated time remaining: {remaining['estimated_remaining_hours']:.1f} hours\n")
+        append("\n")
+
     # Session info
-    report += "## Session Info\n\n"
-    report += f"- Session ID: {session.get('id', 'Unknown')}\n"
-    report += f"- Context Usage: {session.get('context_usage', 0)*100:.0f}%\n"
-    report += f"- Last Updated: {session.get('last_updated', 'Unknown')}\n"
-    
+    append("## Session Info\n\n")
+    append(f"- Session ID: {session.get('id', 'Unknown')}\n")
+    append(f"- Context Usage: {session.get('context_usage', 0)*100:.0f}%\n")
+    append(f"- Last Updated: {session.get('last_updated', 'Unknown')}\n")
+
     if session.get('notes'):
-        report += f"\n**Notes**: {session['notes']}\n"
-    
-    return report
+        append(f"\n**Notes**: {session['notes']}\n")
+
+    return "".join(parts)
 
 
 def generate_json_report(state: dict) -> dict:
     """Generate JSON progress report"""
     
-    tasks = state.get("tasks", [])
-    progress = calculate_progress(tasks)
-    remaining = estimate_remaining(tasks, progress)
-    
+    buckets = partition_tasks(state.get("tasks", []))
+    progress = calculate_progress(buckets)
+    remaining = estimate_remaining(buckets, progress)
+
     return {
         "generated_at": datetime.now().isoformat(),
         "project": state.get("project", {}),
@@ -234,9 +362,9 @@ def generate_json_report(state: dict) -> dict:
         "progress": progress,
         "remaining": remaining,
         "tasks": {
-            "in_progress": [t["id"] for t in tasks if t.get("status") == "in_progress"],
-            "blocked": [t["id"] for t in tasks if t.get("status") in ["blocked", "needs_human"]],
-            "completed": [t["id"] for t in tasks if t.get("status") in ["completed", "verified"]]
+            "in_progress": [t["id"] for t in buckets.in_progress],
+            "blocked": [t["id"] for t in buckets.blocked + buckets.needs_human],
+            "completed": [t["id"] for t in buckets.done]
         },
         "session": state.get("session", {})
     }
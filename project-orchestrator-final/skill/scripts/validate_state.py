@@ -12,28 +12,67 @@ import argparse
 import sys
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
 import json
 
 try:
     import yaml
+    # Prefer the libyaml C bindings when PyYAML was built with them
+    try:
+        from yaml import CSafeLoader as _YamlLoader
+        from yaml import CSafeDumper as _YamlDumper
+    except ImportError:
+        from yaml import SafeLoader as _YamlLoader
+        from yaml import SafeDumper as _YamlDumper
     HAS_YAML = True
 except ImportError:
     HAS_YAML = False
     print("Warning: PyYAML not installed. Using JSON fallback.")
 
+# orjson parses large JSON state files several times faster than stdlib
+# json; it takes the raw bytes directly
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Pick the .yaml reader/writer pair once at import instead of testing
+# HAS_YAML on every call; without PyYAML, .yaml paths fall back to JSON
+if HAS_YAML:
+    def _load_fn(path: Path) -> dict:
+        with open(path) as f:
+            return yaml.load(f, Loader=_YamlLoader)
+
+    def _dump_fn(state: dict, path: Path):
+        with open(path, 'w') as f:
+            yaml.dump(state, f, Dumper=_YamlDumper,
+                      default_flow_style=False, sort_keys=False)
+else:
+    def _load_fn(path: Path) -> dict:
+        return _json_loads(path.read_bytes())
+
+    def _dump_fn(state: dict, path: Path):
+        with open(path, 'w') as f:
+            json.dump(state, f, indent=2)
+
+
+def resolve_state_path(path: Path) -> Path:
+    """Fall back to state.json for projects initialized as JSON"""
+    if not path.exists() and path.suffix == ".yaml" \
+            and path.with_suffix(".json").exists():
+        return path.with_suffix(".json")
+    return path
+
 
 def load_state(path: Path) -> dict:
     """Load state file"""
     if not path.exists():
         raise FileNotFoundError(f"State file not found: {path}")
-    
-    with open(path) as f:
-        if HAS_YAML:
-            return yaml.safe_load(f)
-        else:
-            # Try JSON as fallback
-            return json.load(f)
+
+    if path.suffix == ".json":
+        return _json_loads(path.read_bytes())
+    return _load_fn(path)
 
 
 def validate_required_fields(state: dict) -> list:
@@ -82,96 +121,116 @@ def validate_phase(state: dict) -> list:
     return errors
 
 
+VALID_STATUSES = frozenset((
+    "pending", "in_progress", "completed", "verified", "blocked", "needs_human"
+))
+
+
 def validate_tasks(state: dict) -> tuple[list, list]:
     """Validate tasks section"""
     errors = []
     warnings = []
-    
+    errors_append = errors.append
+    warnings_append = warnings.append
+
     tasks = state.get("tasks", [])
-    task_ids = set()
-    valid_statuses = ["pending", "in_progress", "completed", "verified", "blocked", "needs_human"]
-    
+    # Collect all real IDs up front so the dependency checks can run in
+    # the same pass as the per-task field checks
+    task_ids = {t["id"] for t in tasks if t.get("id")}
+    seen_ids = set()
+
     for i, task in enumerate(tasks):
-        task_id = task.get("id", f"task_at_index_{i}")
-        
+        get = task.get
+        task_id = get("id", f"task_at_index_{i}")
+
         # Check for required task fields
-        if not task.get("id"):
-            errors.append(f"Task at index {i} missing 'id'")
+        if not get("id"):
+            errors_append(f"Task at index {i} missing 'id'")
             continue
-        
-        if not task.get("name"):
-            errors.append(f"Task {task_id} missing 'name'")
-        
+
+        if not get("name"):
+            errors_append(f"Task {task_id} missing 'name'")
+
         # Duplicate check
-        if task_id in task_ids:
-            errors.append(f"Duplicate task ID: {task_id}")
-        task_ids.add(task_id)
-        
+        if task_id in seen_ids:
+            errors_append(f"Duplicate task ID: {task_id}")
+        seen_ids.add(task_id)
+
         # Status validation
-        status = task.get("status")
-        if status not in valid_statuses:
-            errors.append(f"Task {task_id} has invalid status '{status}'")
-        
+        status = get("status")
+        if status not in VALID_STATUSES:
+            errors_append(f"Task {task_id} has invalid status '{status}'")
+
         # Timestamp consistency
-        if status == "completed" and not task.get("completed_at"):
-            warnings.append(f"Task {task_id} is completed but missing 'completed_at'")
-        
-        if status == "verified" and not task.get("verified_at"):
-            warnings.append(f"Task {task_id} is verified but missing 'verified_at'")
-        
-        if status == "in_progress" and not task.get("started_at"):
-            warnings.append(f"Task {task_id} is in_progress but missing 'started_at'")
-        
+        if status == "completed" and not get("completed_at"):
+            warnings_append(f"Task {task_id} is completed but missing 'completed_at'")
+
+        if status == "verified" and not get("verified_at"):
+            warnings_append(f"Task {task_id} is verified but missing 'verified_at'")
+
+        if status == "in_progress" and not get("started_at"):
+            warnings_append(f"Task {task_id} is in_progress but missing 'started_at'")
+
         # Acceptance criteria check
-        criteria = task.get("acceptance_criteria", [])
+        criteria = get("acceptance_criteria", [])
         if len(criteria) < 1:
-            warnings.append(f"Task {task_id} has no acceptance criteria")
-    
-    # Validate dependencies exist
-    for task in tasks:
-        task_id = task.get("id")
-        deps = task.get("dependencies", {})
-        
+            warnings_append(f"Task {task_id} has no acceptance criteria")
+
+        # Validate dependencies exist
+        deps = get("dependencies", {})
+
         for dep in deps.get("hard", []):
             if dep not in task_ids:
-                errors.append(f"Task {task_id} references non-existent dependency: {dep}")
-        
+                errors_append(f"Task {task_id} references non-existent dependency: {dep}")
+
         for dep in deps.get("soft", []):
             if dep not in task_ids:
-                warnings.append(f"Task {task_id} has soft dependency on non-existent task: {dep}")
-    
+                warnings_append(f"Task {task_id} has soft dependency on non-existent task: {dep}")
+
     return errors, warnings
 
 
 def validate_dag(state: dict) -> tuple[bool, str]:
     """Check for circular dependencies"""
     tasks = state.get("tasks", [])
-    
+
+    # A cycle needs at least one hard dependency; most states have few
+    # or none, so skip the whole sort when there is nothing to order
+    if not any(t.get("dependencies", {}).get("hard") for t in tasks):
+        return True, "Valid DAG"
+
     # Build adjacency list
     graph = defaultdict(list)
     in_degree = defaultdict(int)
     all_ids = set()
-    
+
+    add_id = all_ids.add
     for task in tasks:
         task_id = task.get("id")
-        all_ids.add(task_id)
-        
-        for dep in task.get("dependencies", {}).get("hard", []):
+        add_id(task_id)
+
+        hard_deps = task.get("dependencies", {}).get("hard")
+        if not hard_deps:
+            continue
+        for dep in hard_deps:
             graph[dep].append(task_id)
             in_degree[task_id] += 1
-    
-    # Kahn's algorithm for topological sort
-    queue = [t for t in all_ids if in_degree[t] == 0]
+
+    # Kahn's algorithm for topological sort; deque gives O(1) popleft
+    # where list.pop(0) shifts the whole queue
+    queue = deque(t for t in all_ids if in_degree[t] == 0)
     sorted_order = []
-    
+    record = sorted_order.append
+    enqueue = queue.append
+
     while queue:
-        current = queue.pop(0)
-        sorted_order.append(current)
-        
+        current = queue.popleft()
+        record(current)
+
         for neighbor in graph[current]:
             in_degree[neighbor] -= 1
             if in_degree[neighbor] == 0:
-                queue.append(neighbor)
+                enqueue(neighbor)
     
     if len(sorted_order) != len(all_ids):
         remaining = all_ids - set(sorted_order)
@@ -199,24 +258,26 @@ def validate_session(state: dict) -> list:
     return warnings
 
 
-def auto_repair(state: dict, errors: list, warnings: list) -> tuple[dict, list]:
-    """Attempt to auto-repair common issues"""
+def auto_repair(state: dict, errors: list, warnings: list,
+                now: str) -> tuple[dict, list]:
+    """Attempt to auto-repair common issues, stamping them all with now"""
     repairs = []
-    now = datetime.now().isoformat()
-    
+
     # Fix missing timestamps
     for task in state.get("tasks", []):
-        task_id = task.get("id")
-        
-        if task.get("status") == "completed" and not task.get("completed_at"):
+        get = task.get
+        task_id = get("id")
+        status = get("status")
+
+        if status == "completed" and not get("completed_at"):
             task["completed_at"] = now
             repairs.append(f"Set completed_at for {task_id}")
-        
-        if task.get("status") == "verified" and not task.get("verified_at"):
+
+        if status == "verified" and not get("verified_at"):
             task["verified_at"] = now
             repairs.append(f"Set verified_at for {task_id}")
-        
-        if task.get("status") == "in_progress" and not task.get("started_at"):
+
+        if status == "in_progress" and not get("started_at"):
             task["started_at"] = now
             repairs.append(f"Set started_at for {task_id}")
     
@@ -230,12 +291,11 @@ def auto_repair(state: dict, errors: list, warnings: list) -> tuple[dict, list]:
 
 def save_state(state: dict, path: Path):
     """Save state file"""
-    if HAS_YAML:
-        with open(path, 'w') as f:
-            yaml.dump(state, f, default_flow_style=False, sort_keys=False)
-    else:
+    if path.suffix == ".json":
         with open(path, 'w') as f:
             json.dump(state, f, indent=2)
+    else:
+        _dump_fn(state, path)
 
 
 def main():
@@ -259,8 +319,8 @@ def main():
     )
     
     args = parser.parse_args()
-    path = Path(args.path)
-    
+    path = resolve_state_path(Path(args.path))
+
     try:
         state = load_state(path)
     except FileNotFoundError as e:
@@ -326,7 +386,9 @@ def main():
     # Auto-repair if requested
     if args.fix and (all_errors or all_warnings):
         print("\nAttempting auto-repair...")
-        state, repairs = auto_repair(state, all_errors, all_warnings)
+        # One clock read; every repair shares the same timestamp
+        now_iso = datetime.now().isoformat()
+        state, repairs = auto_repair(state, all_errors, all_warnings, now_iso)
         
         if repairs:
             save_state(state, path)
@@ -23,10 +23,16 @@ WORKTREE_DIR = ".worktrees"
 BRANCH_PREFIX = "orchestrator"
 
 
-def run_git(args: list, check: bool = True) -> tuple[int, str, str]:
-    """Run git command and return (returncode, stdout, stderr)"""
+def run_git(args: list, check: bool = True,
+            cwd: str = None) -> tuple[int, str, str]:
+    """Run git command and return (returncode, stdout, stderr).
+
+    cwd targets another directory via `git -C` instead of changing the
+    process working directory.
+    """
+    command = ["git", "-C", cwd] + args if cwd else ["git"] + args
     result = subprocess.run(
-        ["git"] + args,
+        command,
         capture_output=True,
         text=True
     )
@@ -35,6 +41,25 @@ def run_git(args: list, check: bool = True) -> tuple[int, str, str]:
     return result.returncode, result.stdout.strip(), result.stderr.strip()
 
 
+def run_git_lines(args: list):
+    """Run git command and yield stdout lines as they arrive.
+
+    Streams the output instead of buffering it all into one string, so
+    long listings print incrementally and are never held in memory.
+    """
+    process = subprocess.Popen(
+        ["git"] + args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    for line in process.stdout:
+        yield line.rstrip("\n")
+    stderr = process.stderr.read()
+    if process.wait() != 0:
+        raise Exception(f"Git error: {stderr.strip()}")
+
+
 def is_git_repo() -> bool:
     """Check if current directory is a git repository"""
     code, _, _ = run_git(["rev-parse", "--git-dir"], check=False)
@@ -96,56 +121,67 @@ def create_worktree(name: str = None) -> str:
 
 def list_worktrees():
     """List all worktrees"""
-    _, output, _ = run_git(["worktree", "list"])
-    
     print("Git Worktrees:")
     print("-" * 60)
-    
-    for line in output.split("\n"):
+
+    isfile = os.path.isfile
+
+    for line in run_git_lines(["worktree", "list"]):
         if line:
             parts = line.split()
             path = parts[0]
             commit = parts[1] if len(parts) > 1 else ""
             branch = parts[2] if len(parts) > 2 else ""
-            
+
             # Check if orchestrator worktree
             is_orchestrator = WORKTREE_DIR in path or BRANCH_PREFIX in branch
             marker = "🤖" if is_orchestrator else "  "
-            
+
             print(f"{marker} {path}")
             print(f"     Branch: {branch}  Commit: {commit}")
-            
-            # Check for orchestrator state
-            state_file = Path(path) / ".orchestrator" / "state.yaml"
-            if state_file.exists():
+
+            # Check for orchestrator state with plain string joins; one
+            # stat beats building Path objects per worktree. Projects
+            # initialized with the JSON default keep state.json
+            base = path + "/.orchestrator/state."
+            if isfile(base + "json"):
+                print(f"     State: .orchestrator/state.json ✓")
+            elif isfile(base + "yaml"):
                 print(f"     State: .orchestrator/state.yaml ✓")
             print()
 
 
 def show_status():
     """Show current worktree status"""
-    if not is_git_repo():
+    # rev-parse answers several queries in one invocation; this replaces
+    # three git launches (repo check, git-dir, branch) with one
+    code, stdout, _ = run_git(
+        ["rev-parse", "--git-dir", "--abbrev-ref", "HEAD"], check=False
+    )
+    if code != 0:
         print("Error: Not a git repository")
         sys.exit(1)
-    
+
+    git_dir, _, branch = stdout.partition("\n")
+
     # Get current directory
     cwd = Path.cwd()
-    
+
     # Check if in a worktree
-    _, git_dir, _ = run_git(["rev-parse", "--git-dir"])
     is_worktree = ".git/worktrees" in git_dir or "worktrees" in git_dir
     
-    branch = get_current_branch()
-    
     print("Current Status:")
     print("-" * 40)
     print(f"Directory: {cwd}")
     print(f"Branch:    {branch}")
     print(f"Worktree:  {'Yes' if is_worktree else 'No (main repo)'}")
     
-    # Check for orchestrator state
-    state_file = cwd / ".orchestrator" / "state.yaml"
-    if state_file.exists():
+    # Check for orchestrator state; projects initialized with the JSON
+    # default keep state.json
+    base = str(cwd) + "/.orchestrator/state."
+    if os.path.isfile(base + "json"):
+        print(f"State:     .orchestrator/state.json ✓")
+    elif os.path.isfile(base + "yaml"):
         print(f"State:     .orchestrator/state.yaml ✓")
     else:
         print(f"State:     No orchestrator state found")
@@ -171,22 +207,20 @@ def merge_worktree(name: str, squash: bool = True):
         sys.exit(1)
     
     # Check for uncommitted changes in worktree
-    os.chdir(worktree_path)
-    code, stdout, _ = run_git(["status", "--porcelain"], check=False)
+    code, stdout, _ = run_git(["status", "--porcelain"], check=False,
+                              cwd=worktree_path)
     if stdout:
         print(f"Warning: Worktree has uncommitted changes:")
         print(stdout)
         response = input("Commit them before merge? (y/N): ")
         if response.lower() == 'y':
-            run_git(["add", "-A"])
-            run_git(["commit", "-m", f"Final commit for {name}"])
+            run_git(["add", "-A"], cwd=worktree_path)
+            run_git(["commit", "-m", f"Final commit for {name}"],
+                    cwd=worktree_path)
         else:
             print("Aborted. Commit or discard changes first.")
             sys.exit(1)
-    
-    # Go back to main repo
-    os.chdir("../..")
-    
+
     # Get current branch
     current = get_current_branch()
     